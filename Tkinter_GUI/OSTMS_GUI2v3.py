@@ -22,7 +22,7 @@ Features:
 
 Requirements:
 - Python 3.x
-- External Libraries: Tkinter, NumPy, Matplotlib, SciPy, PySerial
+- External Libraries: Tkinter, NumPy, Matplotlib, PySerial
 - Compatible with Windows, macOS, and Linux operating systems.
 
 Usage:
@@ -53,11 +53,11 @@ Nestor212@arizona.edu.
 import tkinter as tk
 from tkinter import ttk, scrolledtext
 import numpy as np
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-from scipy.interpolate import Rbf
 import threading
-from datetime import datetime
+import time
+import queue
 import csv
 import os
 import json
@@ -71,6 +71,55 @@ import OSTMS_serial as ser
 
 
 ICON_PATH = os.path.join(os.path.dirname(__file__), "ENGR498_Logo.png")
+# Minimum change in °C before a temperature label is redrawn
+LABEL_UPDATE_THRESHOLD = 0.05
+# Seconds after a completed port scan during which further Scan presses are ignored
+PORT_SCAN_INTERVAL = 2.0
+# Minimum seconds between heatmap redraws, however fast temperatures arrive
+MIN_PLOT_INTERVAL = 0.5
+# Minimum change (°C) in any sensor temperature before the heatmap is redrawn
+PLOT_UPDATE_THRESHOLD = 0.05
+# Seconds between flushes of the CSV log to disk
+CSV_FLUSH_INTERVAL = 1.0
+# Milliseconds console messages are collected before being written to the console in one insert
+LOG_FLUSH_INTERVAL_MS = 100
+# Milliseconds between passes over the events queued by the serial reader thread
+SERIAL_DRAIN_INTERVAL_MS = 20
+
+# Temperature display styling
+DISPLAY_BG = "#ffffff"
+DISPLAY_FG = "#000000"
+NAME_FONT = ("Helvetica", 20, 'bold')
+VALUE_FONT = ("Helvetica", 20)
+# Value labels are sized for "-100.00°C", so new values never change their size and re-run the grid layout
+VALUE_WIDTH = 9
+# Grid (row, column) of each thermistor name label, its temperature goes in the next column
+SENSOR_PLACEMENTS = [
+    (0, 0),  # T1 in row 1, column 1
+    (0, 4),  # T2 in row 1, column 4
+    (1, 1),  # T3 in row 2, column 2
+    (1, 3),  # T4 in row 2, column 3
+    (2, 0),  # T5 in row 3, column 1
+    (2, 4)   # T6 in row 3, column 4
+]
+
+# Calibration database and the statements run against it
+CALIBRATION_DB = 'poly_calibration_data.db'
+CREATE_CALIBRATION_TABLE_SQL = '''CREATE TABLE IF NOT EXISTS calibration
+                    (TSA INTEGER PRIMARY KEY,
+                    polynomial_coeffs_t1 TEXT, polynomial_coeffs_t2 TEXT,
+                    polynomial_coeffs_t3 TEXT, polynomial_coeffs_t4 TEXT,
+                    polynomial_coeffs_t5 TEXT, polynomial_coeffs_t6 TEXT)'''
+SELECT_CALIBRATION_SQL = "SELECT * FROM calibration WHERE TSA=?"
+# TSA is the primary key, so this inserts the row or replaces all six columns of an existing one
+SAVE_CALIBRATION_SQL = ("INSERT OR REPLACE INTO calibration (TSA, polynomial_coeffs_t1, polynomial_coeffs_t2, polynomial_coeffs_t3, "
+                        "polynomial_coeffs_t4, polynomial_coeffs_t5, polynomial_coeffs_t6) VALUES (?, ?, ?, ?, ?, ?, ?)")
+
+
+def is_coefficient_list(coeffs):
+    # Calibration coefficients are a flat list of numbers, bool is rejected even though it is an int
+    return isinstance(coeffs, list) and all(isinstance(c, (int, float)) and not isinstance(c, bool) for c in coeffs)
+
 
 class GUI:
 # Initilization
@@ -80,20 +129,41 @@ class GUI:
         self.setup_icon()
         
         self.isStarted = False
-        self.start_dt = datetime.now().strftime("%Y_%m_%d_%H:%M")
+        # Used in the log file name, so no colons (invalid in Windows file names)
+        self.start_dt = time.strftime("%Y_%m_%d_%H_%M")
         self.guiUpdateInterval = 1000
         
         self.sample_count = 0
         self.max_samples = 3
         # Initialize temperature_buffers with deques for efficient pop/append operations
         self.temperature_buffers = [deque(maxlen=self.max_samples) for _ in range(7)]
+        # The heatmap is only redrawn every few temperature updates
+        self.plot_count = 0
+        self.last_plot_temps = None
+        self.last_plot_time = 0.0
+        # CSV log file handle and writer, opened when logging starts, and the pending flush callback
+        self.csv_file = None
+        self.csv_writer = None
+        self.csv_flush_id = None
+        # Number of lines kept in the console log
+        self.max_log_lines = 500
+        # Console messages waiting for the next flush, and the pending flush callback
+        self.pending_log = deque(maxlen=self.max_log_lines)
+        self.log_flush_id = None
+        # Serial port file descriptor watched by Tk, when file handlers are used
+        self.serialFd = None
+        # Datetime shown in the header, also used to stamp device messages
+        self.last_time_str = ""
         
         self.setup_variables()
+        self.setup_interpolation()
         self.create_widgets()
         self.setup_serial_port_manager()
+        self.open_database()
         self.create_db_and_table()
         
         self.setup_plots()
+        self.tick_clock()
 
         # Bind the close event
         self.window.protocol("WM_DELETE_WINDOW", self.on_close)
@@ -108,10 +178,42 @@ class GUI:
 
     def setup_variables(self):
         self.portNamesList = []
+        # When the last port scan finished, set by the scan worker
+        self.last_scan_time = None
         self.tsaList = [1, 2, 3, 4, 5, 6]
         self.tsaSelect = 1
         self.points = np.array([(1.125, 0.75), (2.625, 0.75), (1.5750, 0.5), (2.125, 0.5), (1.125, 0.25), (2.625, 0.25)])
-        self.temperatures = np.array([0.0, 0.0, 0.0, 0.0, 0.0, 0.0])
+        self.temperatures = np.zeros(6, dtype=np.float32)
+
+    def setup_interpolation(self):
+        """
+        Precomputes the multiquadric RBF system for the fixed sensor layout.
+        The sensor points and plot grid never change, so the kernel solve and the grid evaluation
+        are folded into a single (grid pixels x sensors) operator and each plot update is one
+        matrix-vector product.
+        """
+        # Grid the interpolated temperatures are evaluated over, 50x50 is smoothed up to the axes size by imshow
+        grid_x, grid_y = np.mgrid[0.75:3:50j, 0:1:50j]
+        grid_points = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+        self.grid_shape = grid_x.shape
+
+        # Same default epsilon as scipy's Rbf: the average distance between points
+        edges = np.ptp(self.points, axis=0)
+        edges = edges[np.nonzero(edges)]
+        epsilon = np.power(np.prod(edges) / len(self.points), 1.0 / edges.size)
+
+        # Multiquadric kernel between the sensor points
+        A = self.multiquadric(self.points, epsilon)
+        # Multiquadric kernel from each grid pixel to each sensor point
+        B = self.multiquadric(grid_points, epsilon)
+        # grid = B @ inv(A) @ temperatures, A is symmetric so B @ inv(A) = (inv(A) @ B.T).T
+        # Stored as contiguous float32, half the memory traffic per frame and plenty of precision for display
+        self.rbf_operator = np.ascontiguousarray(np.linalg.solve(A, B.T).T, dtype=np.float32)
+
+    def multiquadric(self, points, epsilon):
+        # sqrt((r/epsilon)^2 + 1) for the distance r from every point to every sensor point
+        squared_distances = ((points[:, np.newaxis, :] - self.points[np.newaxis, :, :]) ** 2).sum(axis=-1)
+        return np.sqrt(squared_distances / epsilon ** 2 + 1)
  
     def create_widgets(self):
         self.create_controls_frame()
@@ -169,6 +271,14 @@ class GUI:
         self.refOnCheckbox.pack(side=tk.LEFT, padx=(5, 5), pady=20)
         self.refOnCheckbox.config(state="disabled")
 
+        # Plot Every Label
+        self.plotEveryLabel = tk.Label(self.topFrame, text="Plot Every", bg="#303030", fg="white")
+        self.plotEveryLabel.pack(side=tk.LEFT, padx=(5, 5), pady=20)
+
+        # Plot Every spinbox, number of temperature updates between heatmap redraws
+        self.plotEveryVar = tk.IntVar(self.window, value=5)
+        self.plotEverySpinbox = ttk.Spinbox(self.topFrame, from_=1, to=60, textvariable=self.plotEveryVar, width=4, state='readonly')
+        self.plotEverySpinbox.pack(side=tk.LEFT, padx=(5, 5), pady=20)
         
         # LED indicator
         self.ledIndicator = tk.Canvas(self.topFrame, width=20, height=20, bg="#303030", highlightthickness=0)
@@ -193,9 +303,11 @@ class GUI:
         self.temperaturesTitle.pack(side=tk.BOTTOM, expand=True)
 
         # Datetime display in the header frame, aligned to the right
-        self.datetimeData = tk.Label(self.headerFrame, text="0.00", font=("Helvetica", 20), bg="#ffffff", fg="#000000")
+        # Changing display values go through Tk variables bound to the labels
+        self.datetimeVar = tk.StringVar(self.window, value="0.00")
+        self.datetimeData = tk.Label(self.headerFrame, textvariable=self.datetimeVar, font=VALUE_FONT, bg=DISPLAY_BG, fg=DISPLAY_FG)
         self.datetimeData.pack(side=tk.RIGHT, padx=5)
-        self.datetimeLabel = tk.Label(self.headerFrame, text="Datetime:", font=("Helvetica", 20, 'bold'), bg="#ffffff", fg="#000000")
+        self.datetimeLabel = tk.Label(self.headerFrame, text="Datetime:", font=NAME_FONT, bg=DISPLAY_BG, fg=DISPLAY_FG)
         self.datetimeLabel.pack(side=tk.RIGHT, padx=0)
 
         # LabelFrame for temperature sensors and their values
@@ -207,43 +319,53 @@ class GUI:
             self.temperatureDataBox.columnconfigure(col, weight=1)
         self.temperatureDataBox.columnconfigure(5, weight=2)
 
-        # Specific placement for each thermistor and its temperature label
-        placements = [
-            (0, 0),  # T1 in row 1, column 1
-            (0, 4),  # T2 in row 1, column 4
-            (1, 1),  # T3 in row 2, column 2
-            (1, 3),  # T4 in row 2, column 3
-            (2, 0),  # T5 in row 3, column 1
-            (2, 4)   # T6 in row 3, column 4
-        ]
+        self.thermistor_label = [None] * 6  # Initialize the list to store thermistor name labels
         self.temp_label = [None] * 6  # Initialize the list to store temperature labels
+        self.tempVars = [tk.StringVar(self.window, value="0.00°C") for _ in range(6)]
 
-        for i, (row, col) in enumerate(placements):
+        for i, (row, col) in enumerate(SENSOR_PLACEMENTS):
             # Create and place the thermistor label
-            self.thermistor_label = tk.Label(self.temperatureDataBox, text=f"T{i+1}:", font=("Helvetica", 20, 'bold'), bg="#ffffff", fg="#000000")
-            self.thermistor_label.grid(row=row, column=col, sticky="e", padx=5, pady=5)
+            self.thermistor_label[i] = tk.Label(self.temperatureDataBox, text=f"T{i+1}:", font=NAME_FONT, bg=DISPLAY_BG, fg=DISPLAY_FG)
+            self.thermistor_label[i].grid(row=row, column=col, sticky="e", padx=5, pady=5)
 
             # Create and place the temperature label directly next to the thermistor label
-            self.temp_label[i] = tk.Label(self.temperatureDataBox, text="0.00°C", font=("Helvetica", 20), bg="#ffffff", fg="#000000")
+            self.temp_label[i] = tk.Label(self.temperatureDataBox, textvariable=self.tempVars[i], font=VALUE_FONT, bg=DISPLAY_BG, fg=DISPLAY_FG,
+                                          width=VALUE_WIDTH, anchor='w')
             self.temp_label[i].grid(row=row, column=col+1, sticky="w", padx=5, pady=5)
 
         # Placement for reference labels
-        self.refLabel = tk.Label(self.temperatureDataBox, text="Ref:", font=("Helvetica", 20, 'bold'), bg="#ffffff", fg="#000000")
+        self.refLabel = tk.Label(self.temperatureDataBox, text="Ref:", font=NAME_FONT, bg=DISPLAY_BG, fg=DISPLAY_FG)
         self.refLabel.grid(row=3, column=2, sticky="e", padx=0, pady=5)
 
-        self.refTempLabel = tk.Label(self.temperatureDataBox, text="Off", font=("Helvetica", 20), bg="#ffffff", fg="#000000")
+        self.refTempVar = tk.StringVar(self.window, value="Off")
+        self.refTempLabel = tk.Label(self.temperatureDataBox, textvariable=self.refTempVar, font=VALUE_FONT, bg=DISPLAY_BG, fg=DISPLAY_FG,
+                                     width=VALUE_WIDTH, anchor='w')
         self.refTempLabel.grid(row=3, column=3, sticky="w", padx=0, pady=5)
 
+        # Last value shown on each sensor label, and the text shown on the reference label
+        self.displayed_temps = [None] * 6
+        self.displayed_ref = "Off"
+
     def create_console(self):
         self.log = scrolledtext.ScrolledText(self.window, height=10)
         self.log.pack(side=tk.BOTTOM, fill=tk.X)
 
     def setup_plots(self):
-        self.figure, self.ax = plt.subplots()
+        # Embedded figure built with the OO API, it isn't registered with pyplot's figure manager
+        self.figure = Figure()
+        self.ax = self.figure.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.figure, master=self.window)
         self.canvas_widget = self.canvas.get_tk_widget()
         self.canvas_widget.pack(side=tk.TOP, fill=tk.BOTH, expand=1, pady=5)
-        self.updateTemperaturePlot(True)
+        self.initTemperaturePlot()
+
+        # Interpolation runs on a worker thread, only the latest pending frame is kept
+        self.plot_queue = queue.Queue(maxsize=1)
+        # Two grid buffers are passed between the worker and Tk instead of allocating one per frame
+        self.grid_buffers = queue.Queue()
+        for _ in range(2):
+            self.grid_buffers.put(np.empty(self.rbf_operator.shape[0], dtype=np.float32))
+        threading.Thread(target=self.plot_worker, daemon=True).start()
 
 # Event Handlers & Callbacks
     def on_combobox_select(self, event=None):
@@ -262,70 +384,79 @@ class GUI:
     
     def logStatus(self): 
         if(self.logDataVar.get()):
-            self.log.insert(tk.END, f"Logging On: Log File - temperature_data_TSA{self.tsaVar.get()}_{self.start_dt}.csv\n")  # Add to GUI log
- 
-    # def handle_data_received(self, data):
-    #     """
-    #     This method gets called by SerialPortManager with new data.
-    #     It parses the JSON data and updates the GUI with the temperatures.
-    #     """
-    #     time_dt = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
-    #     self.datetimeData.configure(text = time_dt)
-    #     try:            
-    #         # Extract temperature data and update GUI
-    #         if "temps" in data:
-                
-    #             temperatures = data["temps"]
-    #             self.temperatures = temperatures[:6]
-    #             self.updateTemperatures(temperatures)
-                
-    #             # Log the received data for debugging
-    #             # self.log.insert(tk.END, f"Data received: {data}\n")
-    #             # self.log.see(tk.END)
-    #         elif "type" in data and "message" in data:  # Check if it's a log message
-    #             log_message = f"{data['type']}: {data['message']}"
-    #             # print(log_message)  # Print to console or append to a log file
-    #             self.log.insert(tk.END, time_dt + " - " + log_message + "\n")  # Add to GUI log
-        
-    #     except json.JSONDecodeError:
-    #         # If there's an error in parsing JSON, log the error for debugging
-    #         self.log.insert(tk.END, "Failed to parse JSON from incoming data.\n")
-    #         self.log.see(tk.END)
+            self.log_message(f"Logging On: Log File - temperature_data_TSA{self.tsaVar.get()}_{self.start_dt}.csv")  # Add to GUI log
+        else:
+            self.close_csv_log()
  
     def handle_data_received(self, data):
         """
         Optimized to accumulate data and update GUI more efficiently.
         """
-        time_dt = datetime.now().strftime("%Y/%m/%d %H:%M:%S")
-        self.datetimeData.configure(text=time_dt)
-        try:
-            if "temps" in data:
-                temperatures = data["temps"][:7]  # Assuming data for 7 sensors, including reference.
-
-                # Append temperatures to their respective buffers
-                for i, temp in enumerate(temperatures):
-                    self.temperature_buffers[i].append(temp)
+        # One lookup per key, a frame carries either temperatures or a device message
+        temperatures = data.get("temps")
+        if temperatures is not None:
+            # Append temperatures to their respective buffers, assuming data for 7 sensors, including reference
+            temperature_buffers = self.temperature_buffers
+            for buff, temp in zip(temperature_buffers, temperatures[:7]):
+                buff.append(temp)
+            
+            self.sample_count += 1
+            
+            # If enough samples have been collected, average and update GUI
+            max_samples = self.max_samples
+            if self.sample_count == max_samples:
+                self.sample_count = 0  # Reset sample counter
+                averaged_temperatures = [sum(buff) / max_samples for buff in temperature_buffers]
+
+                # Update GUI and log data
+                self.updateTemperatures(averaged_temperatures)
                 
-                self.sample_count += 1
-                
-                # If enough samples have been collected, average and update GUI
-                if self.sample_count == self.max_samples:
-                    self.sample_count = 0  # Reset sample counter
-                    averaged_temperatures = [sum(buff) / self.max_samples for buff in self.temperature_buffers]
-
-                    # Update GUI and log data
-                    self.updateTemperatures(averaged_temperatures)
-                    
-            elif "type" in data and "message" in data:
-                log_message = f"{data['type']}: {data['message']}"
-                self.log.insert(tk.END, time_dt + " - " + log_message + "\n")
-                
-        except json.JSONDecodeError:
-            self.log.insert(tk.END, "Failed to parse JSON from incoming data.\n")
-            self.log.see(tk.END)
+        else:
+            message_type = data.get("type")
+            message = data.get("message")
+            if message_type is not None and message is not None:
+                self.log_message(f"{self.last_time_str} - {message_type}: {message}")
  
     def handle_message(self, message):
-        self.log.insert(tk.END, message + "\n")
+        self.log_message(message)
+
+    def post_to_tk(self, callback):
+        """
+        Wraps a serial callback so calls from the reader thread are queued to run on the Tk thread,
+        in the order they arrive. The thread only puts on a queue, calling into Tcl from it would block
+        until the Tk thread is free, including while stop() waits for the thread to finish.
+        """
+        return lambda *args: self.serial_events.put((callback, args))
+
+    def drain_serial_events(self):
+        """
+        Runs the callbacks queued by the serial reader thread, every SERIAL_DRAIN_INTERVAL_MS while connected.
+        """
+        self.serial_drain_id = None
+        if not self.isStarted:
+            return  # Disconnected, frames the reader queued before it stopped are dropped
+        # Rescheduled first so a failing callback doesn't stop the draining
+        self.serial_drain_id = self.window.after(SERIAL_DRAIN_INTERVAL_MS, self.drain_serial_events)
+        serial_events = self.serial_events
+        while True:
+            try:
+                callback, args = serial_events.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+
+    def on_serial_readable(self, fd, mask):
+        """
+        Tk file handler called when the serial port has data waiting.
+        """
+        if not self.serialPortManager.read_available():
+            # Stop watching a port that can't be read, it would keep reporting readable
+            self.remove_serial_file_handler()
+
+    def remove_serial_file_handler(self):
+        if self.serialFd is not None:
+            self.window.tk.deletefilehandler(self.serialFd)
+            self.serialFd = None
         
     def run_plotter_script(self):
             script_filename = 'Tkinter_GUI/OSTMS_Plotter.py'
@@ -344,17 +475,27 @@ class GUI:
         if stderr:
             self.log_message(f"Error: {stderr}")
 
-    def log_message(self, message):
-        # Assuming you have a method to log messages to your GUI or console
-        print(message)  # Change this to however you handle logging within your GUI
    
 # Serial Port Management
     def scan_ports(self):
-        threading.Thread(target=self.scan_ports_thread, daemon=True).start()
+        # Enumerating ports can take hundreds of ms on Windows, ignore presses right after a scan finished
+        if self.last_scan_time is not None and time.monotonic() - self.last_scan_time < PORT_SCAN_INTERVAL:
+            return
+        # Hand the scan to the scan worker, a press while a scan is already pending is dropped
+        try:
+            self.scan_queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    def scan_worker(self):
+        # Single long-lived thread serving every Scan press
+        while True:
+            self.scan_queue.get()
+            self.scan_ports_thread()
 
     def scan_ports_thread(self):
 
-        self.log.insert(tk.END, "Scanning ports...\n")
+        self.log_message("Scanning ports...")
         # Get a list of available serial ports
         portNamesList = self.get_available_serial_ports()
 
@@ -375,17 +516,10 @@ class GUI:
         self.window.after(0, self.update_option_menu, portNamesList)
     
     def get_available_serial_ports(self):
-        # Clear portNames list
-        portNames = []
-        # Get a list of available serial ports
-        portsList = list_ports.comports()
-        # Sort based on port names
-        portsList = sorted(portsList)
-
-        for port in portsList:
-            portNames.append(port.device)
-
-        return portNames  
+        # Get a sorted list of available serial port names
+        portNames = sorted(port.device for port in list_ports.comports())
+        self.last_scan_time = time.monotonic()
+        return portNames
     
     def update_option_menu(self, portNames):
         # Remove old items
@@ -396,154 +530,233 @@ class GUI:
     
     def setup_serial_port_manager(self):
         # self.serialPortManager = self.serialPortManager = SerialPortManager(data_received_callback=self.handle_data_received, message_callback=self.handle_message)
-        self.serialPortManager = ser.SerialPortManager(callbacks={'data_received': self.handle_data_received,
-                                                              'message': self.handle_message})
+        # Where Tk supports file handlers (not Windows) let it watch the port so the event loop
+        # wakes exactly when data arrives, otherwise fall back to the reader thread
+        self.use_file_handler = hasattr(self.window.tk, 'createfilehandler')
+        if self.use_file_handler:
+            # Callbacks already run on the Tk thread from on_serial_readable
+            callbacks = {'data_received': self.handle_data_received, 'message': self.handle_message}
+        else:
+            # The reader thread posts each frame and message to the Tk thread rather than touching widgets itself
+            callbacks = {'data_received': self.post_to_tk(self.handle_data_received),
+                         'message': self.post_to_tk(self.handle_message)}
+        # Callbacks queued by the reader thread and the pending drain_serial_events call
+        self.serial_events = queue.SimpleQueue()
+        self.serial_drain_id = None
+        self.serialPortManager = ser.SerialPortManager(callbacks=callbacks)
+        # Port scans run on one worker thread, at most one scan waits behind the running one
+        self.scan_queue = queue.Queue(maxsize=1)
+        threading.Thread(target=self.scan_worker, daemon=True).start()
    
     def connect(self):
         if not self.isStarted:
-            self.log.insert(tk.END, "Connecting...\n")
+            self.log_message("Connecting...")
             self.serialPortName = self.selectedPort.get()
             self.tsa_select()
 
             self.serialPortManager.stop()  # Ensure any previous connection is closed
             self.serialPortManager.set_name(self.serialPortName)
-            success, error_message = self.serialPortManager.start()
+            # Start from an empty queue, nothing from a previous connection is handled
+            self.serial_events = queue.SimpleQueue()
+            success, error_message = self.serialPortManager.start(threaded=not self.use_file_handler)
             if success:
                 # Connection was successful
-                self.log.insert(tk.END, f"Connected to: {self.serialPortName}\n")
+                if self.use_file_handler:
+                    self.serialFd = self.serialPortManager.fileno()
+                    self.window.tk.createfilehandler(self.serialFd, tk.READABLE, self.on_serial_readable)
+                self.log_message(f"Connected to: {self.serialPortName}")
                 self.setup_after_connection()
+                if not self.use_file_handler and self.serial_drain_id is None:
+                    self.drain_serial_events()
             else:
                 # Connection failed, display the error message from `start`
-                self.log.insert(tk.END, error_message + "\n")
+                self.log_message(error_message)
                 self.teardown_after_disconnection()
         else:
             # Disconnecting
             self.teardown_after_disconnection()
             self.serialPortManager.stop()
-            self.log.insert(tk.END, "Disconnected.\n")
+            self.log_message("Disconnected.")
 
 # Temperature & Plotting
-    def updateTemperaturePlot(self, colorbar):
+    def interpolate_temperatures(self, temperatures, out=None):
         """
-        Updates the temperature distribution plot.
-        :param colorbar: A boolean indicating whether to display the colorbar.
+        Evaluates the RBF interpolation of the sensor temperatures over the plot grid,
+        writing into out when a preallocated flat grid buffer is given.
         """
-        # Generate radial basis function (RBF) interpolator for the temperature points
-        rbf = Rbf(self.points[:, 0], self.points[:, 1], self.temperatures, function='multiquadric', smooth=0)
-        # Create a grid to evaluate the RBF over
-        grid_x, grid_y = np.mgrid[0.75:3:100j, 0:1:100j]
-        grid_z = rbf(grid_x, grid_y)
-        
-        self.ax.clear()  # Clear the current plot to update it with new data
-        # Display the interpolated temperature data
-        im = self.ax.imshow(grid_z.T, extent=(0.75,3,0,1), origin='lower', cmap='coolwarm', vmin=0, vmax=100)
-        # Add colorbar if specified
-        if colorbar:
-            plt.colorbar(im, ax=self.ax, label='Temperature (°C)')
+        # The weights solve is folded into the operator, so this is a single pass over the grid
+        temperatures = np.asarray(temperatures, dtype=np.float32)
+        return np.matmul(self.rbf_operator, temperatures, out=out).reshape(self.grid_shape)
+
+    def plot_worker(self):
+        """
+        Runs on a background thread, interpolating queued temperatures so the grid
+        evaluation doesn't hold up the Tk thread. Only drawing is handed back to Tk.
+        """
+        while True:
+            temperatures = self.plot_queue.get()
+            # Waits for Tk to hand a buffer back if both are still in flight
+            grid_z = self.interpolate_temperatures(temperatures, out=self.grid_buffers.get())
+            try:
+                self.window.after(0, self.apply_temperature_grid, grid_z)
+            except (RuntimeError, tk.TclError):
+                break  # The window has been destroyed
+
+    def apply_temperature_grid(self, grid_z):
+        # Swap the image data and blit only the axes instead of rebuilding the plot
+        self.tempImage.set_data(grid_z.T)
+        # set_data keeps its own copy, so the buffer can go straight back to the worker
+        self.grid_buffers.put(grid_z.base)
+        self.canvas.restore_region(self.plotBackground)
+        self.ax.draw_artist(self.tempImage)
+        self.ax.draw_artist(self.pointScatter)
+        self.canvas.blit(self.ax.bbox)
+
+    def initTemperaturePlot(self):
+        """
+        Creates the temperature distribution image, colorbar and measurement points once.
+        Later updates only swap the image data, see updateTemperaturePlot.
+        """
+        grid_z = self.interpolate_temperatures(self.temperatures)
+        self.last_plot_temps = np.array(self.temperatures)
+        # Display the interpolated temperature data on a fixed 0-100 °C scale
+        self.tempImage = self.ax.imshow(grid_z.T, extent=(0.75,3,0,1), origin='lower', cmap='coolwarm', vmin=0, vmax=100, interpolation='bilinear')
+        self.figure.colorbar(self.tempImage, ax=self.ax, label='Temperature (°C)')
         # Scatter plot to show the actual measurement points
-        self.ax.scatter(self.points[:, 0], self.points[:, 1], c='black', s=50, zorder=5)
-        self.canvas.draw()  # Redraw the canvas with the updated plot
+        self.pointScatter = self.ax.scatter(self.points[:, 0], self.points[:, 1], c='black', s=50, zorder=5)
+        # Recache the blit background after every full draw, e.g. when the window is resized
+        self.canvas.mpl_connect('draw_event', self.on_plot_draw)
+        self.canvas.draw()
+
+    def on_plot_draw(self, event):
+        self.plotBackground = self.canvas.copy_from_bbox(self.ax.bbox)
+
+    def updateTemperaturePlot(self):
+        """
+        Updates the temperature distribution plot with the current temperatures.
+        """
+        # Nothing to redraw if no temperature has visibly changed since the last plot
+        if np.abs(self.temperatures - self.last_plot_temps).max() < PLOT_UPDATE_THRESHOLD:
+            return
+        self.last_plot_temps = np.array(self.temperatures)
+        self.last_plot_time = time.monotonic()
+
+        # Hand the temperatures to the plot worker, replacing any frame it hasn't picked up yet
+        try:
+            self.plot_queue.get_nowait()
+        except queue.Empty:
+            pass
+        self.plot_queue.put_nowait(self.last_plot_temps)
 
     def updateTemperatures(self, temperatures):
         """
         Updates the GUI labels with the new temperature data.
         """
-        # print(datetime.now().strftime("%Y/%m/%d %H:%M:%S"))
-        for i, temp in enumerate(temperatures):
-            # Ensure we do not update more labels than we have
-            if i < len(self.temp_label):
-                # Update the label with the new temperature
-                if self.calOnVar.get():
-                    cal_temp = self.TSA.get_calibrated_temp(f"t{i+1}",temp)
-                else:
-                    cal_temp = temp
-                self.temp_label[i].configure(text=f"{cal_temp:.2f}°C")
-    
-            # If you have a reference temperature to update
-            if self.refOnVar.get() and i == len(temperatures) - 1:  # Assuming the last value is the reference temperature
-                self.refTempLabel.configure(text=f"{temp:.2f}°C")
-            else:
-                self.refTempLabel.configure(text="Off")
-        self.temperatures = temperatures[:6]
-        self.updateTemperaturePlot(False)
+        # The first six values are the sensors, in the same order as the sensor labels
+        raw_temps = temperatures[:6]
+        # Calibrate all six sensors in one vectorized call
+        display_temps = self.TSA.get_calibrated_temps(raw_temps) if self.calOnVar.get() else raw_temps
+        for i, (tempVar, cal_temp) in enumerate(zip(self.tempVars, display_temps)):
+            # Slide temperatures drift slowly, only update the label when the value has visibly changed
+            shown = self.displayed_temps[i]
+            if shown is None or abs(cal_temp - shown) >= LABEL_UPDATE_THRESHOLD:
+                tempVar.set(f"{cal_temp:.2f}°C")
+                self.displayed_temps[i] = cal_temp
+
+        # The reference temperature follows the six sensor values
+        if self.refOnVar.get() and len(temperatures) > 6:
+            ref_text = f"{temperatures[6]:.2f}°C"
+        else:
+            ref_text = "Off"
+        # Only pass the text to Tk when it differs from what is shown, e.g. not "Off" every update
+        if ref_text != self.displayed_ref:
+            self.refTempVar.set(ref_text)
+            self.displayed_ref = ref_text
+        # Update the plotted temperatures in place rather than replacing the array
+        self.temperatures[:] = temperatures[:6]
+
+        # Redraw the heatmap every plotEvery updates, and no more often than MIN_PLOT_INTERVAL,
+        # labels and logging still update every time
+        self.plot_count += 1
+        if self.plot_count >= self.plotEveryVar.get() and time.monotonic() - self.last_plot_time >= MIN_PLOT_INTERVAL:
+            self.plot_count = 0
+            self.updateTemperaturePlot()
         
         if self.logDataVar.get():
             self.log_temperatures_to_csv(temperatures)
 
 # Calibration & Database
+    def open_database(self):
+        """
+        Opens the calibration database once, the connection is reused for every calibration
+        read and write and closed in on_close.
+        """
+        self.db = sqlite3.connect(CALIBRATION_DB, check_same_thread=False)
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        # Calibration rows by TSA id, only save_calibration_data changes them
+        self.calibration_cache = {}
+
     def create_db_and_table(self):
-        conn = sqlite3.connect('poly_calibration_data.db')
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS calibration
-                    (TSA INTEGER PRIMARY KEY,
-                    polynomial_coeffs_t1 TEXT, polynomial_coeffs_t2 TEXT,
-                    polynomial_coeffs_t3 TEXT, polynomial_coeffs_t4 TEXT,
-                    polynomial_coeffs_t5 TEXT, polynomial_coeffs_t6 TEXT)''')
-        conn.commit()
-        conn.close()
+        self.db.execute(CREATE_CALIBRATION_TABLE_SQL)
+        self.db.commit()
 
     def load_thermistor_sensor_assembly(self, tsa_id=1):
-        conn = sqlite3.connect('poly_calibration_data.db')
-        c = conn.cursor()
         tsa = TSA.ThermistorSensorAssembly(tsa_id)
         calibration_data = {}
         try:
-            c.execute("SELECT * FROM calibration WHERE TSA=?", (tsa_id,))
-            data = c.fetchone()
+            if tsa_id not in self.calibration_cache:
+                self.calibration_cache[tsa_id] = self.db.execute(SELECT_CALIBRATION_SQL, (tsa_id,)).fetchone()
+            data = self.calibration_cache[tsa_id]
             if data:
-                for i in range(1, 7):
-                    coeffs_str = data[i]
-                    coeffs = json.loads(coeffs_str) if coeffs_str else []
-                    sensor_id = f"t{i}"
-                    tsa.set_sensor_calibration(sensor_id, coeffs)
-                    calibration_data[sensor_id] = coeffs_str
+                coeffs_strs = data[1:]
+                coeffs_list = []
+                for sensor_id, coeffs_str in zip(TSA.ThermistorSensorAssembly.SENSOR_IDS, coeffs_strs):
+                    try:
+                        coeffs = json.loads(coeffs_str) if coeffs_str else []
+                        if not is_coefficient_list(coeffs):
+                            raise ValueError("not a list of numbers")
+                    except (ValueError, TypeError) as e:
+                        # A bad row must not stop the TSA from loading, the sensor is left uncalibrated
+                        self.log_message(f"Invalid calibration for TSA {tsa_id} sensor {sensor_id} ({e}), using no calibration.")
+                        coeffs = []
+                    coeffs_list.append(coeffs)
+                tsa.set_calibrations(coeffs_list)
+                # The stored text is returned unchanged so a bad row can be corrected in the calibration window
+                calibration_data = dict(zip(TSA.ThermistorSensorAssembly.SENSOR_IDS, coeffs_strs))
         except sqlite3.Error as e:
             print(f"Database error: {e}")
-        finally:
-            conn.close()
         return tsa, calibration_data  # Return both the assembly and calibration data
 
 
 
     def save_calibration_data(self):
+        # Validate every sensor's coefficients before anything is written
+        coeffs_jsons = []
+        for sensor_id in range(1, 7):
+            raw_coeffs = self.calibration_entries[f"t{sensor_id}"].get()  # Get the string from the Entry widget
+            try:
+                # Attempt to parse the string as a list; this also validates the format
+                coeffs_list = json.loads(raw_coeffs)
+                if not is_coefficient_list(coeffs_list):
+                    raise ValueError(f"Coefficients of sensor {sensor_id} must be a list of numbers.")
+            except json.JSONDecodeError:
+                tk.messagebox.showerror("Error", f"Invalid format for coefficients of sensor {sensor_id}. Please enter a valid JSON list.")
+                return
+            except ValueError as e:
+                tk.messagebox.showerror("Error", str(e))
+                return
+            # Convert list back to JSON string for storage
+            coeffs_jsons.append(json.dumps(coeffs_list))
+
         try:
-            conn = sqlite3.connect('poly_calibration_data.db')
-            c = conn.cursor()
-            # Check if the entry exists
-            c.execute("SELECT count(*) FROM calibration WHERE TSA=?", (self.tsaSelect,))
-            exists = c.fetchone()[0]
-
-            if not exists:
-                # Insert a new row if TSA doesn't exist
-                # Create placeholders for each polynomial_coeffs column
-                placeholders = ', '.join(['?' for _ in range(6)])  # 6 coefficient columns
-                # Add a placeholder for the TSA at the beginning
-                c.execute(f"INSERT INTO calibration (TSA, polynomial_coeffs_t1, polynomial_coeffs_t2, polynomial_coeffs_t3, polynomial_coeffs_t4, polynomial_coeffs_t5, polynomial_coeffs_t6) VALUES (?, {placeholders})", (self.tsaSelect, '[]', '[]', '[]', '[]', '[]', '[]'))
-
-            # Now, perform the update for each sensor
-            for sensor_id in range(1, 7):
-                raw_coeffs = self.calibration_entries[f"t{sensor_id}"].get()  # Get the string from the Entry widget
-                try:
-                    # Attempt to parse the string as a list; this also validates the format
-                    coeffs_list = json.loads(raw_coeffs)
-                    if not isinstance(coeffs_list, list):
-                        raise ValueError("Coefficients must be in list format.")
-                    # Convert list back to JSON string for storage
-                    coeffs_json = json.dumps(coeffs_list)
-                except json.JSONDecodeError:
-                    tk.messagebox.showerror("Error", f"Invalid format for coefficients of sensor {sensor_id}. Please enter a valid JSON list.")
-                    return
-                except ValueError as e:
-                    tk.messagebox.showerror("Error", str(e))
-                    return
-
-                column_name = f'polynomial_coeffs_t{sensor_id}'
-                c.execute(f"UPDATE calibration SET {column_name} = ? WHERE TSA = ?", (coeffs_json, self.tsaSelect))
-
-            conn.commit()
-            conn.close()
+            # Write the whole row in one statement, committed on success and rolled back on error
+            with self.db:
+                self.db.execute(SAVE_CALIBRATION_SQL, (self.tsaSelect, *coeffs_jsons))
+            # Reread the saved row the next time this TSA is loaded
+            self.calibration_cache.pop(self.tsaSelect, None)
             tk.messagebox.showinfo("Success", "Calibration data saved successfully.")
-        except Exception as e:
+        except sqlite3.Error as e:
             tk.messagebox.showerror("Error", str(e))
 
     def open_calibration_window(self):
@@ -576,15 +789,46 @@ class GUI:
         save_button.pack(pady=10)
 
 # Utility and Cleanup
+    def tick_clock(self):
+        # The datetime label only changes once per second, so it is updated here rather than per serial frame
+        now = time.time()
+        self.last_time_str = time.strftime("%Y/%m/%d %H:%M:%S", time.localtime(now))
+        self.datetimeVar.set(self.last_time_str)
+        # Reschedule just after the next second boundary so the display doesn't drift
+        self.window.after(1000 - int(now * 1000) % 1000, self.tick_clock)
+
     def log_message(self, message):
-        self.log.insert(tk.END, f"{message}\n")
+        # Queue the message, the console is written at most once per LOG_FLUSH_INTERVAL_MS
+        self.pending_log.append(message)
+        if self.log_flush_id is None:
+            self.log_flush_id = self.window.after(LOG_FLUSH_INTERVAL_MS, self.flush_log)
+
+    def flush_log(self):
+        """
+        Writes the queued console messages in a single insert.
+        """
+        self.log_flush_id = None
+        # popleft rather than clear, a message queued from the serial thread meanwhile isn't lost
+        lines = [self.pending_log.popleft() for _ in range(len(self.pending_log))]
+        if not lines:
+            return  # Another thread scheduled a second flush at the same time, the first wrote everything
+        self.log.insert(tk.END, "\n".join(lines) + "\n")
+        # Keep only the last max_log_lines lines so the console doesn't grow for the whole session
+        line_count = int(self.log.index('end-1c').split('.')[0])
+        if line_count > self.max_log_lines:
+            self.log.delete('1.0', f"{line_count - self.max_log_lines}.0")
         self.log.see(tk.END)
 
     def tsa_select(self):
         print(f"Selected TSA: {self.tsaSelect}")
         self.TSA, _ = self.load_thermistor_sensor_assembly(self.tsaSelect)
  
-    def log_temperatures_to_csv(self, temperatures, ref_temperature=None):
+    def open_csv_log(self):
+        """
+        Opens the CSV log file once and keeps the handle and writer for the rest of the session.
+        Rows are buffered and flushed every CSV_FLUSH_INTERVAL seconds while the log is open, the live
+        plotter rereads the file once a second so it still sees new rows promptly.
+        """
         filename = f"Tkinter_GUI/TestData/temperature_data_TSA{self.tsaVar.get()}_{self.start_dt}.csv"
         # Adjust headers to account for each sensor having dedicated columns for raw and calibrated temperatures
         headers = ["Timestamp", "Calibration On", "Ref Temperature"]
@@ -592,33 +836,51 @@ class GUI:
             headers.extend([f"Raw T{i}", f"Calibrated T{i}", f"Polynomial Coeffs T{i}"])
 
         file_exists = os.path.isfile(filename)
-        with open(filename, mode='a', newline='') as file:
-            writer = csv.writer(file)
-            if not file_exists:
-                writer.writerow(headers)
-
-            now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            cal_on = "Yes" if self.calOnVar.get() else "No"
-            ref_temp_entry = ref_temperature if ref_temperature is not None else "N/A"
-
-            # Prepare a list to accumulate data for all sensors
-            sensor_data = []
-            for sensor_id in range(1, 7):
-                sensor_key = f"t{sensor_id}"
-                raw_temp = temperatures[sensor_id - 1]
-                calibrated_temp = "N/A"  # Default if calibration is off
-                polynomial_coeffs = "N/A"
-                if self.calOnVar.get():
-                    calibrated_temp = self.TSA.get_calibrated_temp(sensor_key, raw_temp)
-                    calibration_data = self.TSA.get_sensor_calibration(sensor_key)
-                    polynomial_coeffs = ', '.join(map(str, calibration_data)) if calibration_data else "N/A"
-                
-                # Add sensor's raw temp, calibrated temp, and coeffs to the list
-                sensor_data.extend([raw_temp, calibrated_temp, polynomial_coeffs])
+        self.csv_file = open(filename, mode='a', newline='')
+        self.csv_writer = csv.writer(self.csv_file)
+        if not file_exists:
+            self.csv_writer.writerow(headers)
+        self.csv_flush_id = self.window.after(int(CSV_FLUSH_INTERVAL * 1000), self.flush_csv_log)
+
+    def flush_csv_log(self):
+        # Runs on a timer rather than per row, so rows reach the disk even while the device is quiet
+        self.csv_file.flush()
+        self.csv_flush_id = self.window.after(int(CSV_FLUSH_INTERVAL * 1000), self.flush_csv_log)
+
+    def close_csv_log(self):
+        if self.csv_flush_id is not None:
+            self.window.after_cancel(self.csv_flush_id)
+            self.csv_flush_id = None
+        if self.csv_file is not None:
+            self.csv_file.close()
+            self.csv_file = None
+            self.csv_writer = None
+
+    def log_temperatures_to_csv(self, temperatures, ref_temperature=None):
+        if self.csv_file is None:
+            self.open_csv_log()
+
+        now = time.strftime("%Y-%m-%d %H:%M:%S")
+        cal_on = "Yes" if self.calOnVar.get() else "No"
+        ref_temp_entry = ref_temperature if ref_temperature is not None else "N/A"
+
+        # Calibrate all sensors in one call, the coefficient text is cached by the assembly
+        raw_temps = temperatures[:6]
+        if self.calOnVar.get():
+            calibrated_temps = self.TSA.get_calibrated_temps(raw_temps).tolist()
+            polynomial_coeffs = self.TSA.get_coefficient_strings()
+        else:
+            calibrated_temps = polynomial_coeffs = ["N/A"] * 6  # Defaults if calibration is off
+
+        # Each sensor's raw temp, calibrated temp, and coeffs
+        sensor_data = []
+        for sensor_row in zip(raw_temps, calibrated_temps, polynomial_coeffs):
+            sensor_data.extend(sensor_row)
 
-            # Construct the row for this instance of logging
-            row = [now, cal_on, ref_temp_entry] + sensor_data
-            writer.writerow(row)
+        # Construct the row for this instance of logging
+        row = [now, cal_on, ref_temp_entry] + sensor_data
+        # Flushed by flush_csv_log, closing the log flushes whatever is left
+        self.csv_writer.writerow(row)
 
 
     def setup_after_connection(self):
@@ -647,11 +909,18 @@ class GUI:
         self.connectButton.configure(text="Connect")
         # Change the LED indicator to red, indicating no active connection
         self.ledIndicator.itemconfig(self.ledCircle, fill="red")
+        # Stop watching the serial port before it is closed
+        self.remove_serial_file_handler()
+        # Close the CSV log so it is complete on disk
+        self.close_csv_log()
         # Any additional teardown steps can be added here
 
     def on_close(self):
+        self.remove_serial_file_handler()
         if self.serialPortManager.isRunning:
             self.serialPortManager.stop()
+        self.close_csv_log()
+        self.db.close()
         self.window.destroy()
 
 if __name__ == "__main__":
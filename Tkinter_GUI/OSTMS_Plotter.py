@@ -1,7 +1,7 @@
 import tkinter as tk
 from tkinter import ttk, filedialog
 import pandas as pd
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from matplotlib.backends.backend_tkagg import NavigationToolbar2Tk
 from matplotlib.animation import FuncAnimation
@@ -31,8 +31,9 @@ class CSVPlotterApp(tk.Tk):
         self.pause_button = ttk.Button(self, text="Pause", command=self.toggle_plotting)
         self.pause_button.pack(pady=20)
 
-        # Frame for Plot
-        self.fig, self.ax = plt.subplots()
+        # Frame for Plot, built with the OO API so pyplot doesn't create and track its own figure manager
+        self.fig = Figure()
+        self.ax = self.fig.add_subplot(111)
         self.canvas = FigureCanvasTkAgg(self.fig, self)
         self.plot_widget = self.canvas.get_tk_widget()
         self.plot_widget.pack(fill=tk.BOTH, expand=True)
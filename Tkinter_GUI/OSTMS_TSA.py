@@ -1,4 +1,12 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
 class ThermistorSensor:
+    __slots__ = ('identifier', 'polynomial_coeffs')
+
     def __init__(self, identifier):
         self.identifier = identifier
         # Initialize with a default polynomial that represents a linear function y = x
@@ -8,14 +16,19 @@ class ThermistorSensor:
     def set_calibration_data(self, polynomial_coeffs):
         if isinstance(polynomial_coeffs, int):
             polynomial_coeffs = [polynomial_coeffs]  # Convert single integer to list
+        if not polynomial_coeffs:
+            # No coefficients stored (e.g. '[]' in the database) means uncalibrated, not a constant 0
+            polynomial_coeffs = [1, 0]
         self.polynomial_coeffs = polynomial_coeffs
     
     def get_calibration_data(self):
         return self.polynomial_coeffs
     
     def get_calibrated_temp(self, rawTemp):
-        # Calculate calibrated temperature using polynomial coefficients
-        calibrated_temp = sum(coef * rawTemp ** power for power, coef in enumerate(reversed(self.polynomial_coeffs)))
+        # Calculate calibrated temperature using polynomial coefficients, highest power first (Horner's method)
+        calibrated_temp = 0
+        for coef in self.polynomial_coeffs:
+            calibrated_temp = calibrated_temp * rawTemp + coef
         # print(self.polynomial_coeffs)
         return calibrated_temp
     
@@ -24,35 +37,92 @@ class ThermistorSensor:
 
         
 class ThermistorSensorAssembly:
+    __slots__ = ('identifier', 'sensors', 'coeff_columns', 'coeff_strings')
+    # Assuming 6 sensors in each assembly, their ids are formatted once for every assembly
+    SENSOR_IDS = tuple(f"t{i+1}" for i in range(6))
+    # Position of each sensor id in the sensors list
+    SENSOR_INDEX = {sensor_id: index for index, sensor_id in enumerate(SENSOR_IDS)}
+
     def __init__(self, identifier):
         self.identifier = identifier
-        # Assuming 6 sensors in each assembly
-        self.sensors = {f"t{i+1}": ThermistorSensor(f"t{i+1}") for i in range(6)}
+        # Sensors in id order, callers still address them by id through SENSOR_INDEX
+        self.sensors = [ThermistorSensor(sensor_id) for sensor_id in self.SENSOR_IDS]
+        # Polynomial coefficients of all sensors, one row per power (highest first) and one column
+        # per sensor, so get_calibrated_temps steps through contiguous rows
+        self.coeff_columns = self.build_coeff_columns()
+        # Coefficients of each sensor formatted as text, built on demand for the CSV log
+        self.coeff_strings = None
 
     def get_ID(self):
         return self.identifier
     
     def set_sensor_calibration(self, sensor_id, polynomial_coeffs):
-        if sensor_id in self.sensors:
-            self.sensors[sensor_id].set_calibration_data(polynomial_coeffs)
+        index = self.SENSOR_INDEX.get(sensor_id)
+        if index is not None:
+            self.sensors[index].set_calibration_data(polynomial_coeffs)
+            self.coeff_columns = self.build_coeff_columns()
+            self.coeff_strings = None
         else:
-            print(f"Sensor {sensor_id} not found in assembly.")
+            logger.warning("Sensor %s not found in assembly.", sensor_id)
+
+    def set_calibrations(self, coeffs_list):
+        """
+        Sets the coefficients of every sensor at once, in sensor order (t1, t2, ...).
+        The coefficient array is rebuilt once instead of after each sensor.
+        """
+        for sensor, polynomial_coeffs in zip(self.sensors, coeffs_list):
+            sensor.set_calibration_data(polynomial_coeffs)
+        self.coeff_columns = self.build_coeff_columns()
+        self.coeff_strings = None
 
     def get_sensor_calibration(self, sensor_id):
-        if sensor_id in self.sensors:
-            return self.sensors[sensor_id].get_calibration_data()
+        index = self.SENSOR_INDEX.get(sensor_id)
+        if index is not None:
+            return self.sensors[index].get_calibration_data()
         else:
-            print(f"Sensor {sensor_id} not found in assembly.")
+            logger.warning("Sensor %s not found in assembly.", sensor_id)
             return None
         
     def get_calibrated_temp(self, sensor_id, rawTemp):
-        if sensor_id in self.sensors:
-            return self.sensors[sensor_id].get_calibrated_temp(rawTemp)
+        index = self.SENSOR_INDEX.get(sensor_id)
+        if index is not None:
+            return self.sensors[index].get_calibrated_temp(rawTemp)
         else:
-            print(f"Sensor {sensor_id} not found in assembly.")
+            logger.warning("Sensor %s not found in assembly.", sensor_id)
             return None
 
+    def get_calibrated_temps(self, raw_temps):
+        """
+        Calibrates the raw temperatures of all sensors at once, in sensor order (t1, t2, ...).
+        Evaluates every sensor's polynomial together with Horner's method.
+        """
+        raw_temps = np.asarray(raw_temps, dtype=float)
+        calibrated_temps = np.zeros_like(raw_temps)
+        for coeffs in self.coeff_columns:
+            calibrated_temps *= raw_temps
+            calibrated_temps += coeffs
+        return calibrated_temps
+
+    def get_coefficient_strings(self):
+        """
+        Returns each sensor's coefficients as comma separated text, in sensor order.
+        Cached until the calibration changes.
+        """
+        if self.coeff_strings is None:
+            self.coeff_strings = tuple(', '.join(map(str, sensor.get_calibration_data()))
+                                       for sensor in self.sensors)
+        return self.coeff_strings
+
+    def build_coeff_columns(self):
+        # Coefficients right-aligned so shorter polynomials are padded with leading zeros
+        coeffs_list = [sensor.get_calibration_data() for sensor in self.sensors]
+        degree = max(len(coeffs) for coeffs in coeffs_list)
+        coeff_columns = np.zeros((degree, len(coeffs_list)))
+        for column, coeffs in enumerate(coeffs_list):
+            coeff_columns[-len(coeffs):, column] = coeffs
+        return coeff_columns
+
     def __repr__(self):
-        calibration_coeffs = {sensor_id: sensor.get_calibration_data() for sensor_id, sensor in self.sensors.items()}
+        calibration_coeffs = {sensor.identifier: sensor.get_calibration_data() for sensor in self.sensors}
         return f"ThermistorSensorAssembly(ID: {self.identifier}, Sensors Calibration: {calibration_coeffs})"
 
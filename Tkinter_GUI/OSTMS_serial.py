@@ -1,6 +1,21 @@
 import serial
-import json
 import threading
+import weakref
+import logging
+try:
+    # orjson parses the frames several times faster when installed, the standard json module otherwise
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+logger = logging.getLogger(__name__)
+
+
+def close_port(serialPort):
+    # Finalizer for a manager dropped without stop(), takes the port rather than the manager
+    if serialPort.isOpen():
+        serialPort.close()
+
 
 class SerialPortManager:
 # Initialization
@@ -12,39 +27,60 @@ class SerialPortManager:
         self.serialPortName = ''
         self.isRunning = False
         self.read_thread = None
-        self.threadStop = False  # Add a flag to signal the thread to stop
+        self.threadStop = threading.Event()  # Signals the reader thread to stop
+        self.rxBuffer = bytearray()  # Received bytes not yet split into lines
+        self.portFinalizer = None  # Closes the open port if the manager is collected while running
 
 # Configuration and State Management
     def set_name(self, serialPortName):
         self.serialPortName = serialPortName
 
-    def start(self):
+    def start(self, threaded=True):
+        """
+        Opens the serial port. With threaded=False no reader thread is started, the caller is
+        expected to call read_available() whenever fileno() becomes readable.
+        """
         if self.isRunning or not self.serialPortName:
             return False, "Serial port is already running or no port selected."
         try:
             self.serialPort = serial.Serial(self.serialPortName, self.serialPortBaud, timeout=2)
+            # USB serial adapters (FTDI) hold received bytes for up to 16 ms by default, ask Linux drivers not to
+            if hasattr(self.serialPort, 'set_low_latency_mode'):
+                try:
+                    self.serialPort.set_low_latency_mode(True)
+                except (ValueError, NotImplementedError):
+                    pass  # Not every driver or platform (macOS, BSD) supports it, the port works either way
+            self.rxBuffer.clear()
+            self.portFinalizer = weakref.finalize(self, close_port, self.serialPort)
+            self.threadStop.clear()
             self.isRunning = True
-            self.read_thread = threading.Thread(target=self.read_from_port, daemon=True)
-            self.read_thread.start()
+            if threaded:
+                self.read_thread = threading.Thread(target=self.read_from_port, daemon=True)
+                self.read_thread.start()
             return True, ""  # No error message needed on success
         except serial.SerialException as e:
-            error_message = f"Failed to open serial port: {e}"
-            print(error_message)
-            return False, error_message
+            logger.warning("Failed to open serial port: %s", e)
+            return False, f"Failed to open serial port: {e}"
 
     def stop(self):
         if self.isRunning:
             self.isRunning = False
-            
+            self.threadStop.set()
+
             if self.read_thread and self.read_thread.is_alive():
+                # Wake the reader from its blocking read instead of waiting out the port timeout
+                self.serialPort.cancel_read()
                 self.read_thread.join(timeout=5)  # Wait for the thread to terminate, with a timeout
             
             try:
                 if self.serialPort and self.serialPort.isOpen():
                     self.serialPort.close()
             except Exception as e:
-                print(f"Error closing serial port: {e}")
+                logger.warning("Error closing serial port: %s", e)
             
+            if self.portFinalizer:
+                self.portFinalizer.detach()  # The port is already closed
+                self.portFinalizer = None
             self.read_thread = None
             self.serialPort = None
 
@@ -53,26 +89,70 @@ class SerialPortManager:
             try:
                 self.serialPort.write(data.encode('utf-8'))
             except serial.SerialException as e:
-                print(f"Error sending data: {e}")
+                logger.warning("Error sending data: %s", e)
 
 # Data Handling
+    def fileno(self):
+        return self.serialPort.fileno()
+
+    def read_available(self):
+        """
+        Reads whatever is waiting on the port without blocking and dispatches the complete lines.
+        Returns False if the port could not be read.
+        """
+        try:
+            self.rxBuffer += self.serialPort.read(self.serialPort.in_waiting)
+        except (OSError, serial.SerialException) as e:
+            self.call_callback('message', f"Error reading from serial port: {e}")
+            self.call_callback('message', "Disconnect and try again.")
+            return False
+        self.dispatch_lines()
+        return True
+
     def read_from_port(self):
-        while self.isRunning:
+        # Read the port into a local once, stop() may clear self.serialPort while this thread is still running
+        serialPort = self.serialPort
+        read = serialPort.read
+        rxBuffer = self.rxBuffer
+        stopped = self.threadStop.is_set
+        while not stopped():
             try:
-                if self.serialPort.inWaiting() > 0:
-                    line = self.serialPort.readline().decode('utf-8').strip()
-                    if line:
-                        try:
-                            data = json.loads(line)
-                            self.call_callback('data_received', data)
-                        except json.JSONDecodeError as e:
-                            self.call_callback('message', f"JSON Decode Error: {e}")
+                # Read everything already waiting in one call, or block (up to the port timeout) for the next byte
+                rxBuffer += read(serialPort.in_waiting or 1)
             except (OSError, serial.SerialException) as e:
                 self.call_callback('message', f"Error reading from serial port: {e}")
                 self.call_callback('message', "Disconnect and try again.")
                 break  # or continue, depending on desired behavior
-            
-            # time.sleep(0.1)  # Adjust sleep time as needed
+            self.dispatch_lines()
+
+    def dispatch_lines(self):
+        # Dispatch every complete line in the buffer, keeping any partial line for the next read.
+        # Lines are scanned by offset and the consumed bytes dropped once, so a burst of many
+        # lines doesn't shift the rest of the buffer after each one.
+        start = 0
+        try:
+            newline = self.rxBuffer.find(b'\n')
+            while newline != -1:
+                # json_loads takes the raw bytes, no separate decode
+                line = self.rxBuffer[start:newline].strip()
+                start = newline + 1
+                if not line:
+                    pass  # Blank line
+                elif not (line.startswith(b'{') and line.endswith(b'}')):
+                    # Every frame is a JSON object, anything else (partial frames, noise) is rejected without the decoder
+                    self.call_callback('message', "JSON Decode Error: line is not a JSON object")
+                else:
+                    try:
+                        data = json_loads(line)
+                    except ValueError as e:  # Both modules' JSONDecodeError, or UnicodeDecodeError for corrupted bytes
+                        self.call_callback('message', f"JSON Decode Error: {e}")
+                    else:
+                        self.call_callback('data_received', data)
+                newline = self.rxBuffer.find(b'\n', start)
+        finally:
+            # Drop the lines handed out so far even if a callback raised, so they aren't dispatched again
+            if start:
+                del self.rxBuffer[:start]
 
 # Callback Management
     def set_callback(self, event_name, callback):
@@ -81,7 +161,3 @@ class SerialPortManager:
     def call_callback(self, event_name, *args, **kwargs):
         if event_name in self.callbacks:
             self.callbacks[event_name](*args, **kwargs)
-
-# Utility
-    def __del__(self):
-        self.stop()
\ No newline at end of file